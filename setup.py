@@ -10,7 +10,6 @@ setup(
         "jsonschema",
         "python-dotenv",
         "numpy",
-        "colour-science",
         "logger_tt",
     ],
     entry_points={
@@ -2,44 +2,34 @@
 # file: main.py (Updated)
 #
 import time
+from dataclasses import dataclass, field
 from enum import Enum, auto
+from typing import Callable
 
-from openrgb import OpenRGBClient
-from openrgb.utils import DeviceType, RGBColor
+from openrgb.utils import DeviceType, RGBContainer
 
-from src.gradients import LIQUID_HSV, RAM_CHASE_BOTTOM_HSV, RAM_CHASE_TOP_HSV
-from src.utils.effects.breathing import Breathing
-
-from .gradients import (
-    flame_gradient,
-    ocean_bands_gradient,
-    ocean_shimmer_gradient,
-    tropical_waters_gradient,
-)
+from .gradients import LIQUID_HSV, flame_gradient, tropical_waters_gradient
 
 # Import the framework and your custom effect classes
 from .stage_manager import StageManager
+from .utils.debug_utils import debug_print
 from .utils.effects import (
+    Breathing,
     Chase,
     ChaseRamp,
     Effect,
     FadeIn,
     FadeToBlack,
-    FlickerRamp,  # Using the staged version as it seems to be what you're using
     LiquidFill,
     StaticBrightness,
 )
 from .utils.effects.color_source import (
     ColorShift,
-    Gradient,
-    MultiGradient,
     ScrollingColorSource,
     StaticColor,
 )
 from .utils.openrgb_helper import (
     ZoneConfig,
-    configure_motherboard_zones,
-    configure_standalone_devices,
     connect_with_retry,
     setup_hardware_with_retry,
 )
@@ -72,6 +62,215 @@ HARDWARE_SETUP_TIMEOUT = 60
 HARDWARE_SETUP_INTERVAL = 1.0  # Seconds between hardware setup attempts
 
 
+@dataclass
+class ShowEffects:
+    """Every effect the show uses, built once at startup and reset on reuse."""
+
+    main_strimmer: StaticBrightness
+    main_chase1: Chase
+    main_chase2: Chase
+    main_fan_chase: ChaseRamp
+    fade_strimmer: FadeToBlack
+    fade_fans: FadeToBlack
+    fade_dram1: FadeIn
+    fade_dram2: FadeIn
+    idle_ram1: StaticBrightness
+    idle_ram2: StaticBrightness
+    idle_fan_chase: Chase
+    idle_strimmer_chase: Chase
+    idle_breathing_fans: Breathing
+
+
+@dataclass
+class ShowContext:
+    """The devices and long-lived color sources shared by the state builders."""
+
+    manager: StageManager
+    strimmer: RGBContainer
+    fans: RGBContainer
+    dram_sticks: list[RGBContainer]
+    fan_scrolling_color: ColorShift
+    ram_idle_scrolling_color_1: ScrollingColorSource
+    ram_idle_scrolling_color_2: ScrollingColorSource
+    idle_fan_color: ScrollingColorSource
+    idle_strimmer_color: ScrollingColorSource
+    idle_breathing_colors: ScrollingColorSource
+    effects: ShowEffects = field(init=False)
+
+    def __post_init__(self):
+        self.effects = _build_effects(self)
+
+
+def _build_effects(ctx: ShowContext) -> ShowEffects:
+    """Constructs all of the show's effects up front."""
+    FADE_OUT_DURATION = 3.0
+    return ShowEffects(
+        # Use StaticBrightness to show the scrolling flame at its full, self-defined brightness
+        main_strimmer=StaticBrightness(
+            ctx.strimmer, color_source=ctx.fan_scrolling_color, brightness=1.0
+        ),
+        main_chase1=Chase(
+            ctx.dram_sticks[0],
+            color_source=ctx.fan_scrolling_color,
+            speed=20,
+            delay=0.0,
+            width=3,
+            duration=None,
+            loop_interval=1,
+            reverse=True,
+        ),
+        main_chase2=Chase(
+            ctx.dram_sticks[1],
+            color_source=ctx.fan_scrolling_color,
+            speed=20,
+            delay=RAM_OFFSET,
+            width=3,
+            duration=None,
+            loop_interval=1,
+            reverse=True,
+        ),
+        main_fan_chase=ChaseRamp(
+            ctx.fans,
+            color_source=ctx.fan_scrolling_color,
+            initial_speed=5,
+            acceleration=10,
+            max_speed=120,
+            max_width=100,
+            dither_strength=0.14,
+            reverse=True,
+        ),
+        fade_strimmer=FadeToBlack(
+            ctx.strimmer,
+            color_source=ctx.fan_scrolling_color,
+            duration=FADE_OUT_DURATION,
+        ),
+        fade_fans=FadeToBlack(
+            ctx.fans,
+            color_source=ctx.fan_scrolling_color,
+            duration=FADE_OUT_DURATION,
+        ),
+        # The FadeIn effect now reveals the gradient's own brightness,
+        # rather than fading from black to a fully bright version of the gradient.
+        fade_dram1=FadeIn(
+            ctx.dram_sticks[0],
+            color_source=ctx.ram_idle_scrolling_color_1,
+            duration=FADE_OUT_DURATION,
+        ),
+        fade_dram2=FadeIn(
+            ctx.dram_sticks[1],
+            color_source=ctx.ram_idle_scrolling_color_2,
+            duration=FADE_OUT_DURATION,
+        ),
+        # --- NEW: Set up the infinite idle effects for the RAM ---
+        idle_ram1=StaticBrightness(
+            ctx.dram_sticks[0],
+            color_source=ctx.ram_idle_scrolling_color_1,
+            brightness=1.0,  # duration=None is default for infinite
+        ),
+        idle_ram2=StaticBrightness(
+            ctx.dram_sticks[1],
+            color_source=ctx.ram_idle_scrolling_color_2,
+            brightness=1.0,  # duration=None is default for infinite
+        ),
+        # --- NEW: Add chase effects for fans and strimmer in idle state ---
+        idle_fan_chase=Chase(
+            ctx.fans,
+            color_source=ctx.idle_fan_color,
+            speed=IDLE_CHASE_SPEED,
+            delay=IDLE_CHASE_DELAY,
+            width=3,
+            duration=None,
+            loop_interval=IDLE_CHASE_INTERVAL,  # long loop interval
+            reverse=False,
+        ),
+        idle_strimmer_chase=Chase(
+            ctx.strimmer,
+            color_source=ctx.idle_strimmer_color,
+            speed=IDLE_CHASE_SPEED,
+            delay=IDLE_CHASE_DELAY,
+            width=3,
+            duration=None,
+            loop_interval=IDLE_CHASE_INTERVAL,  # long loop interval
+            reverse=False,
+        ),
+        idle_breathing_fans=Breathing(
+            ctx.fans,
+            color_source=ctx.idle_breathing_colors,
+            min_brightness=0,
+            on_duration=30,
+            off_duration=90,
+            transition_duration=5,
+            speed=5.0,
+            duration=None,  # Infinite breathing
+        ),
+    )
+
+
+def _restart(manager: StageManager, *effects: Effect):
+    """Resets prebuilt effects to their initial state and layers them in order."""
+    for effect in effects:
+        effect.reset()
+        manager.add_effect(effect)
+
+
+def _start_main_show(ctx: ShowContext) -> list[Effect]:
+    """Enters STATE_2_MAIN_SHOW and returns the effects that block the next state."""
+    print(f"[{AppState.STATE_2_MAIN_SHOW.name}] Starting...")
+    fx = ctx.effects
+    ctx.manager.clear_effects(ctx.strimmer)
+    _restart(
+        ctx.manager,
+        fx.main_strimmer,
+        fx.main_chase1,
+        fx.main_chase2,
+        fx.main_fan_chase,
+    )
+    ctx.fan_scrolling_color.reset()
+    return [fx.main_fan_chase]
+
+
+def _start_fade_out(ctx: ShowContext) -> list[Effect]:
+    """Enters STATE_3_FADE_OUT and returns the effects that block the next state."""
+    print(f"[{AppState.STATE_3_FADE_OUT.name}] Starting...")
+    fx = ctx.effects
+    ctx.manager.clear_all_effects()
+    blocking = [fx.fade_strimmer, fx.fade_fans, fx.fade_dram1, fx.fade_dram2]
+    _restart(ctx.manager, *blocking)
+    return blocking
+
+
+def _start_idle(ctx: ShowContext) -> list[Effect]:
+    """Enters STATE_4_IDLE. Its effects run forever, so they never unblock."""
+    print(f"[{AppState.STATE_4_IDLE.name}] Startup complete. Running idle effects.")
+    fx = ctx.effects
+    ctx.manager.clear_all_effects()
+    # The idle color sources are built at startup; restart their animation
+    # clocks so they begin scrolling from here.
+    ctx.idle_fan_color.reset()
+    ctx.idle_strimmer_color.reset()
+    ctx.idle_breathing_colors.reset()
+    _restart(
+        ctx.manager,
+        fx.idle_ram1,
+        fx.idle_ram2,
+        fx.idle_fan_chase,
+        fx.idle_strimmer_chase,
+        fx.idle_breathing_fans,
+    )
+    return [fx.idle_ram1, fx.idle_ram2, fx.idle_fan_chase, fx.idle_strimmer_chase]
+
+
+# Maps each state to the state that follows it once its blocking effects have
+# finished, and to the function that sets that next state up.
+STATE_TRANSITIONS: dict[
+    AppState, tuple[AppState, Callable[[ShowContext], list[Effect]]]
+] = {
+    AppState.STATE_1_LIQUID: (AppState.STATE_2_MAIN_SHOW, _start_main_show),
+    AppState.STATE_2_MAIN_SHOW: (AppState.STATE_3_FADE_OUT, _start_fade_out),
+    AppState.STATE_3_FADE_OUT: (AppState.STATE_4_IDLE, _start_idle),
+}
+
+
 def run():
     """Main function to run the lighting controller."""
     try:
@@ -84,14 +283,12 @@ def run():
         )
 
         # Part 2: Configure Hardware (with its own timeout)
-        manager, motherboard_zones, standalone_devices, all_managed_devices = (
-            setup_hardware_with_retry(
-                client=client,
-                timeout=HARDWARE_SETUP_TIMEOUT,
-                interval=HARDWARE_SETUP_INTERVAL,
-                zone_configs=ZONE_CONFIGS,
-                device_types=STANDALONE_DEVICES,
-            )
+        manager, motherboard_zones, standalone_devices, _ = setup_hardware_with_retry(
+            client=client,
+            timeout=HARDWARE_SETUP_TIMEOUT,
+            interval=HARDWARE_SETUP_INTERVAL,
+            zone_configs=ZONE_CONFIGS,
+            device_types=STANDALONE_DEVICES,
         )
         strimmer = motherboard_zones.get("strimmer")
         fans = motherboard_zones.get("fans")
@@ -109,7 +306,21 @@ def run():
         return
 
     current_state = AppState.STATE_1_LIQUID
-    blocking_effects: list[Effect] = []
+
+    # The number of blocking effects of the current state still running. The
+    # effects count themselves down as they finish, so the loop never has to
+    # poll them.
+    remaining_blocking = 0
+
+    def on_blocking_finished(effect: Effect):
+        nonlocal remaining_blocking
+        remaining_blocking -= 1
+
+    def block_on(effects: list[Effect]):
+        nonlocal remaining_blocking
+        remaining_blocking = len(effects)
+        for blocking_effect in effects:
+            blocking_effect.finished_callback = on_blocking_finished
 
     # --- Define Color Sources using the new HSV format ---
     strimmer_source = StaticColor(hsv=LIQUID_HSV)  # <-- NOW USES (H,S,V)
@@ -141,200 +352,77 @@ def run():
         initial_roll_ratio=RAM_OFFSET,
     )
 
+    ctx = ShowContext(
+        manager=manager,
+        strimmer=strimmer,
+        fans=fans,
+        dram_sticks=dram_sticks,
+        fan_scrolling_color=fan_scrolling_color,
+        ram_idle_scrolling_color_1=ram_idle_scrolling_color_1,
+        ram_idle_scrolling_color_2=ram_idle_scrolling_color_2,
+        idle_fan_color=ScrollingColorSource(
+            source=ram_idle_gradient,
+            speed=10.0,
+            pause=20,
+            scroll_fraction=1.6,
+            initial_roll_ratio=0.0,
+        ),
+        idle_strimmer_color=ScrollingColorSource(
+            source=ram_idle_gradient,
+            speed=10.0,
+            pause=20,
+            scroll_fraction=1.6,
+            initial_roll_ratio=RAM_OFFSET,
+        ),
+        idle_breathing_colors=ScrollingColorSource(
+            source=ram_idle_gradient,
+            speed=10.0,
+            resolution_multiplier=32,
+            initial_roll_ratio=RAM_OFFSET,
+        ),
+    )
+
     # --- Kick off the sequence ---
     print(f"[{current_state.name}] Starting...")
     effect = LiquidFill(strimmer, color_source=strimmer_source, speed=5.0)
     manager.add_effect(effect)
-    blocking_effects.append(effect)
+    block_on([effect])
 
     # --- Main Application Loop ---
     try:
+        # Frames are paced against absolute deadlines so sleep overshoot
+        # doesn't accumulate into drift.
+        # Bind the per-frame callables to locals once; the loop runs at FPS.
+        update = manager.update
+        monotonic = time.monotonic
+        sleep = time.sleep
+
+        next_deadline = monotonic()
         while current_state != AppState.EXITING:
-            loop_start_time = time.monotonic()
-            manager.update()
-
-            is_state_finished = all(effect.is_finished() for effect in blocking_effects)
-
-            if is_state_finished:
-                if current_state == AppState.STATE_1_LIQUID:
-                    current_state = AppState.STATE_2_MAIN_SHOW
-                    print(f"[{current_state.name}] Starting...")
-                    blocking_effects.clear()
-                    manager.clear_effects(strimmer)
-                    # Use StaticBrightness to show the scrolling flame at its full, self-defined brightness
-                    manager.add_effect(
-                        StaticBrightness(
-                            strimmer, color_source=fan_scrolling_color, brightness=1.0
-                        )
-                    )
-                    chase1 = Chase(
-                        dram_sticks[0],
-                        color_source=fan_scrolling_color,
-                        speed=20,
-                        delay=0.0,
-                        width=3,
-                        duration=None,
-                        loop_interval=1,
-                        reverse=True,
-                    )
-                    chase2 = Chase(
-                        dram_sticks[1],
-                        color_source=fan_scrolling_color,
-                        speed=20,
-                        delay=RAM_OFFSET,
-                        width=3,
-                        duration=None,
-                        loop_interval=1,
-                        reverse=True,
-                    )
-
-                    fan_chase = ChaseRamp(
-                        fans,
-                        color_source=fan_scrolling_color,
-                        initial_speed=5,
-                        acceleration=10,
-                        max_speed=120,
-                        max_width=100,
-                        dither_strength=0.14,
-                        reverse=True,
-                    )
-                    manager.add_effect(chase1)
-                    manager.add_effect(chase2)
-                    manager.add_effect(fan_chase)
-                    blocking_effects = [fan_chase]
-                    fan_scrolling_color.reset()
-
-                elif current_state == AppState.STATE_2_MAIN_SHOW:
-                    current_state = AppState.STATE_3_FADE_OUT
-                    print(f"[{current_state.name}] Starting...")
-                    blocking_effects.clear()
-                    manager.clear_all_effects()
-
-                    FADE_OUT_DURATION = 3.0
-                    fade_strimmer = FadeToBlack(
-                        strimmer,
-                        color_source=fan_scrolling_color,
-                        duration=FADE_OUT_DURATION,
-                    )
-                    fade_fans = FadeToBlack(
-                        fans,
-                        color_source=fan_scrolling_color,
-                        duration=FADE_OUT_DURATION,
-                    )
-                    # The FadeIn effect now reveals the gradient's own brightness,
-                    # rather than fading from black to a fully bright version of the gradient.
-                    fade_dram1 = FadeIn(
-                        dram_sticks[0],
-                        color_source=ram_idle_scrolling_color_1,
-                        duration=FADE_OUT_DURATION,
-                    )
-                    fade_dram2 = FadeIn(
-                        dram_sticks[1],
-                        color_source=ram_idle_scrolling_color_2,
-                        duration=FADE_OUT_DURATION,
-                    )
-                    manager.add_effect(fade_strimmer)
-                    manager.add_effect(fade_fans)
-                    manager.add_effect(fade_dram1)
-                    manager.add_effect(fade_dram2)
-                    blocking_effects = [
-                        fade_strimmer,
-                        fade_fans,
-                        fade_dram1,
-                        fade_dram2,
-                    ]
-
-                elif current_state == AppState.STATE_3_FADE_OUT:
-                    current_state = AppState.STATE_4_IDLE
-                    print(
-                        f"[{current_state.name}] Startup complete. Running idle effects."
-                    )
-                    blocking_effects.clear()
-                    manager.clear_all_effects()
-                    # --- NEW: Set up the infinite idle effects for the RAM ---
-                    idle_ram1 = StaticBrightness(
-                        dram_sticks[0],
-                        color_source=ram_idle_scrolling_color_1,
-                        brightness=1.0,  # duration=None is default for infinite
-                    )
-                    idle_ram2 = StaticBrightness(
-                        dram_sticks[1],
-                        color_source=ram_idle_scrolling_color_2,
-                        brightness=1.0,  # duration=None is default for infinite
-                    )
-                    manager.add_effect(idle_ram1)
-                    manager.add_effect(idle_ram2)
-
-                    # --- NEW: Add chase effects for fans and strimmer in idle state ---
-                    idle_fan_color = ScrollingColorSource(
-                        source=ram_idle_gradient,
-                        speed=10.0,
-                        pause=20,
-                        scroll_fraction=1.6,
-                        initial_roll_ratio=0.0,
-                    )
-                    idle_strimmer_color = ScrollingColorSource(
-                        source=ram_idle_gradient,
-                        speed=10.0,
-                        pause=20,
-                        scroll_fraction=1.6,
-                        initial_roll_ratio=RAM_OFFSET,
-                    )
-                    idle_fan_chase = Chase(
-                        fans,
-                        color_source=idle_fan_color,
-                        speed=IDLE_CHASE_SPEED,
-                        delay=IDLE_CHASE_DELAY,
-                        width=3,
-                        duration=None,
-                        loop_interval=IDLE_CHASE_INTERVAL,  # long loop interval
-                        reverse=False,
-                    )
-                    idle_strimmer_chase = Chase(
-                        strimmer,
-                        color_source=idle_strimmer_color,
-                        speed=IDLE_CHASE_SPEED,
-                        delay=IDLE_CHASE_DELAY,
-                        width=3,
-                        duration=None,
-                        loop_interval=IDLE_CHASE_INTERVAL,  # long loop interval
-                        reverse=False,
-                    )
-                    idle_breathing_colors = ScrollingColorSource(
-                        source=ram_idle_gradient,
-                        speed=10.0,
-                        resolution_multiplier=32,
-                        initial_roll_ratio=RAM_OFFSET,
-                    )
-                    idle_breathing_fans = Breathing(
-                        fans,
-                        color_source=idle_breathing_colors,
-                        min_brightness=0,
-                        on_duration=30,
-                        off_duration=90,
-                        transition_duration=5,
-                        speed=5.0,
-                        duration=None,  # Infinite breathing
-                    )
-                    manager.add_effect(idle_fan_chase)
-                    manager.add_effect(idle_strimmer_chase)
-                    manager.add_effect(idle_breathing_fans)
-
-                    blocking_effects.extend(
-                        [idle_ram1, idle_ram2, idle_fan_chase, idle_strimmer_chase]
-                    )
-
-            elapsed = time.monotonic() - loop_start_time
-            if (sleep_time := FRAME_TIME - elapsed) > 0:
-                time.sleep(sleep_time)
+            update()
+
+            if remaining_blocking == 0 and current_state in STATE_TRANSITIONS:
+                current_state, enter_state = STATE_TRANSITIONS[current_state]
+                block_on(enter_state(ctx))
+
+            next_deadline += FRAME_TIME
+            now = monotonic()
+            if (sleep_time := next_deadline - now) > 0:
+                sleep(sleep_time)
+            else:
+                # Missed the deadline; resync instead of catching up with a
+                # burst of back-to-back frames.
+                debug_print(
+                    f"Frame overran its deadline by {-sleep_time * 1000:.1f} ms "
+                    f"({int(-sleep_time / FRAME_TIME)} frame(s) dropped)."
+                )
+                next_deadline = now
 
     except KeyboardInterrupt:
         print("\nInterrupted by user. Shutting down.")
     finally:
         print("Clearing all devices to black.")
-        for device in all_managed_devices:
-            device.clear()
-            device.show()
+        manager.blackout()
 
 
 if __name__ == "__main__":
@@ -1,14 +1,70 @@
 #
 # file: stage_manager.py
 #
-import time
-from typing import Sequence
+import struct
+import threading
+from typing import Optional, Sequence
 
-from openrgb.utils import RGBColor, RGBContainer
+import numpy as np
+from openrgb.network import NOSIGNAL, NetworkClient
+from openrgb.orgb import Device, Zone
+from openrgb.utils import (
+    CONNECTION_ERRORS,
+    ModeColors,
+    OpenRGBDisconnected,
+    PacketType,
+    RGBColor,
+    RGBContainer,
+)
 
 from .utils.effects.effect import Effect
 
 
+def _led_packet_prefix(container: RGBContainer) -> Optional[bytes]:
+    """
+    Builds the header and fixed data fields of the packet that sets every LED
+    of `container`: UPDATEZONELEDS for a zone, UPDATELEDS for a whole device.
+    The packet is completed by appending 4 color bytes per LED.
+
+    Returns None for containers that can't be updated this way, such as a
+    device whose active mode has no per-LED colors.
+    """
+    num_leds = len(container.leds)
+    if isinstance(container, Zone):
+        packet_type = PacketType.RGBCONTROLLER_UPDATEZONELEDS
+        data_size = struct.calcsize(f"IiH{num_leds * 4}x")
+        fields = struct.pack("<IiH", data_size, container.id, num_leds)
+    elif (
+        isinstance(container, Device)
+        and container.modes[container.active_mode].color_mode == ModeColors.PER_LED
+    ):
+        packet_type = PacketType.RGBCONTROLLER_UPDATELEDS
+        data_size = struct.calcsize(f"IH{num_leds * 4}x")
+        fields = struct.pack("<IH", data_size, num_leds)
+    else:
+        return None
+    header = struct.pack("<4sIII", b"ORGB", container.device_id, packet_type, data_size)
+    return header + fields
+
+
+def _send_raw(comms: NetworkClient, data: bytes):
+    """
+    Writes already packed SDK packets to the server in a single socket write,
+    holding the client's lock like its own send methods do.
+    """
+    if comms.sock is None:
+        raise OpenRGBDisconnected()
+    if not comms.lock.acquire(timeout=10):
+        raise OpenRGBDisconnected("SDK server did not respond to previous request")
+    try:
+        comms.sock.sendall(data, NOSIGNAL)
+    except CONNECTION_ERRORS as e:
+        # stop_connection() also releases the lock.
+        comms.stop_connection()
+        raise OpenRGBDisconnected() from e
+    comms.lock.release()
+
+
 class StageManager:
     """
     Manages and renders effects for a list of OpenRGB devices.
@@ -18,6 +74,11 @@ class StageManager:
     and then pushes the final results to the hardware in a tight loop.
     This "calculate all, then show all" approach ensures maximum performance
     and visual synchronization across multiple devices.
+
+    The hardware writes run on a background sender thread that always sends
+    the latest frame of each device, so a slow socket write never stalls the
+    render loop; stale frames are dropped instead. Call `close()` to flush
+    and stop the sender.
     """
 
     def __init__(self, devices: Sequence[RGBContainer]):
@@ -27,23 +88,94 @@ class StageManager:
         Args:
             devices: A list of OpenRGB aRGBContainer objects to be managed.
         """
-        self.devices = devices
+        self.devices = tuple(devices)
 
-        # A dictionary mapping each device to its list of active effects.
-        self._effects_map: dict[RGBContainer, list[Effect]] = {
-            dev: [] for dev in devices
+        # Per-device state is kept in parallel lists indexed by device
+        # position, so the per-frame loop never hashes a device. The index
+        # map is only used when effects are added or cleared.
+        self._device_index: dict[RGBContainer, int] = {
+            dev: i for i, dev in enumerate(self.devices)
         }
 
-        # A drawing canvas for each device to avoid creating new color lists every frame.
-        self._canvases: dict[RGBContainer, list[RGBColor]] = {
-            dev: [RGBColor(0, 0, 0) for _ in dev.leds] for dev in devices
+        # Each device's list of active effects.
+        self._effects: list[list[Effect]] = [[] for _ in self.devices]
+
+        # One contiguous framebuffer for all devices, holding one packed uint32
+        # color per LED in the same R, G, B, 0 byte layout as effect frames.
+        # Each device's canvas is a view onto its own slice of it.
+        led_counts = [len(dev.leds) for dev in self.devices]
+        self._framebuffer = np.zeros(sum(led_counts), dtype=np.uint32)
+        offsets = np.concatenate(([0], np.cumsum(led_counts)))
+        self._canvases: list[np.ndarray] = [
+            self._framebuffer[offsets[i] : offsets[i + 1]]
+            for i in range(len(self.devices))
+        ]
+
+        # Zones and devices are updated with hand-packed LED update packets,
+        # and all packets for one connection are sent in a single write. This
+        # maps each container to its packet's constant header and data fields.
+        self._packet_prefixes: dict[RGBContainer, bytes] = {}
+        for dev in self.devices:
+            prefix = _led_packet_prefix(dev)
+            if prefix is not None:
+                self._packet_prefixes[dev] = prefix
+
+        # RGBColor objects handed to the client for the other devices,
+        # rewritten in place every frame so no color objects are allocated
+        # per LED.
+        self._color_pools: dict[RGBContainer, list[RGBColor]] = {
+            dev: [RGBColor(0, 0, 0) for _ in dev.leds]
+            for dev in self.devices
+            if dev not in self._packet_prefixes
+        }
+
+        # The raw bytes of the last canvas sent to each device. A frame that is
+        # byte-identical to it is not sent again.
+        self._last_sent: dict[RGBContainer, bytes] = {}
+
+        # Whether each device had any effects on the previous frame. A device
+        # with no effects on this frame or the last one is known to be black
+        # and already sent, so it is not compared again. Starts True so every
+        # device is sent black once.
+        self._drew_last_frame: list[bool] = [True] * len(self.devices)
+
+        # (device, canvas) pairs for the show phase.
+        self._outputs: tuple[tuple[RGBContainer, np.ndarray], ...] = tuple(
+            zip(self.devices, self._canvases)
+        )
+
+        # The latest unsent frame of each device, handed to the sender thread.
+        # Only the newest frame per device is kept; older ones are dropped.
+        self._pending: dict[RGBContainer, np.ndarray] = {}
+        self._pending_cv = threading.Condition()
+
+        # Each device owns two send buffers: at most one waits in `_pending`
+        # while the sender reads the other, so frames are handed over without
+        # allocating. Buffers not in flight sit in the device's free list.
+        self._free_buffers: dict[RGBContainer, list[np.ndarray]] = {
+            dev: [np.zeros_like(canvas) for _ in range(2)]
+            for dev, canvas in self._outputs
         }
+        self._closing = False
+        self._sender_error: BaseException | None = None
+        self._sender = threading.Thread(
+            target=self._send_loop, name="StageManagerSender", daemon=True
+        )
+        self._sender.start()
 
     def add_effect(self, effect: Effect):
         """Adds a new effect to the effect's target device. The new effect will be layered on top."""
         device = effect.rgb_container
-        if device in self._effects_map:
-            self._effects_map[device].append(effect)
+        index = self._device_index.get(device)
+        if index is not None:
+            # Frames are blended with a straight whole-canvas copy, so an
+            # effect must render exactly one color per LED of its device.
+            if effect.num_leds != len(self._canvases[index]):
+                raise ValueError(
+                    f"Effect renders {effect.num_leds} LEDs but device "
+                    f"'{str(device)}' has {len(self._canvases[index])}."
+                )
+            self._effects[index].append(effect)
         else:
             print(
                 f"Warning: Device '{str(device)}' is not managed by this StageManager."
@@ -51,14 +183,16 @@ class StageManager:
 
     def clear_effects(self, device: RGBContainer):
         """Removes all effects from a specific device."""
-        if device in self._effects_map:
-            self._effects_map[device].clear()
+        index = self._device_index.get(device)
+        if index is not None:
+            self._effects[index].clear()
 
     def get_active_effects(self, device: RGBContainer) -> list[Effect]:
         """Returns the list of currently active (not finished) effects for a device."""
-        return self._effects_map.get(device, [])
+        index = self._device_index.get(device)
+        return self._effects[index] if index is not None else []
 
-    def update(self):
+    def update(self) -> int:
         """
         Executes one full update and render cycle. This should be called once per frame.
 
@@ -66,39 +200,162 @@ class StageManager:
         1. Calculate: Compute the color frames for all active effects.
         2. Blend & Cleanup: Layer the effect frames onto their respective device
            canvases and remove any effects that have finished.
-        3. Show: Push the final canvases to the hardware.
+        3. Show: Push the final canvases to the hardware, skipping any device
+           whose canvas is unchanged since the last frame it was sent. Devices
+           that stayed without effects are skipped without comparing at all.
+
+        Returns:
+            The number of effects that finished during this frame.
         """
         # --- Phase 1 & 2: Calculate, Blend, and Cleanup ---
-        for device, active_effects in self._effects_map.items():
-            # Start with a black canvas for this device
-            canvas = self._canvases[device]
-            for i in range(len(canvas)):
-                canvas[i] = RGBColor(0, 0, 0)
+        finished_count = 0
+        dirty = []
+        # Start every device from black with a single clear of the framebuffer.
+        self._framebuffer.fill(0)
+        for i, (canvas, active_effects) in enumerate(
+            zip(self._canvases, self._effects)
+        ):
+            dirty.append(bool(active_effects) or self._drew_last_frame[i])
+            self._drew_last_frame[i] = bool(active_effects)
+            if not active_effects:
+                continue
 
-            effects_to_keep = []
+            device_finished = 0
             for effect in active_effects:
-                # Calculate the frame for this effect
-                effect_frame = effect.calculate_frame()
+                # Calculate the frame for this effect. Every effect still has
+                # to advance, even when a later layer hides it.
+                top_frame = effect.calculate_frame()
 
-                # Simple "last on top wins" blend.
-                for i, color in enumerate(effect_frame):
-                    if i < len(canvas):
-                        canvas[i] = color
+                if effect.is_finished():
+                    device_finished += 1
+                    if effect.finished_callback is not None:
+                        effect.finished_callback(effect)
 
-                # Keep the effect for the next frame only if it's not finished
-                if not effect.is_finished():
-                    effects_to_keep.append(effect)
+            # Frames are opaque and cover the whole device (checked in
+            # add_effect), so "last on top wins" is a copy of the top frame.
+            np.copyto(canvas, top_frame)
 
-            # Update the list of effects for the device
-            self._effects_map[device] = effects_to_keep
+            # Drop finished effects. Between state changes nothing finishes,
+            # so the device's list is normally left as it is.
+            if device_finished:
+                finished_count += device_finished
+                active_effects[:] = [
+                    effect for effect in active_effects if not effect.is_finished()
+                ]
 
         # --- Phase 3: Show All ---
-        # After ALL calculations are done, send the data to hardware in a tight loop.
-        for device in self.devices:
-            device.set_colors(self._canvases[device])
-            device.show(fast=True)
+        # After ALL calculations are done, hand the changed canvases to the
+        # sender thread. Canvases are copied into a send buffer because the
+        # next frame reuses them; a frame the sender has not picked up yet is
+        # overwritten in place.
+        if self._sender_error is not None:
+            raise self._sender_error
+
+        last_sent = self._last_sent
+        with self._pending_cv:
+            for (device, canvas), is_dirty in zip(self._outputs, dirty):
+                if not is_dirty:
+                    continue
+                frame_bytes = canvas.tobytes()
+                if frame_bytes == last_sent.get(device):
+                    continue
+                last_sent[device] = frame_bytes
+                buffer = self._pending.get(device)
+                if buffer is None:
+                    buffer = self._free_buffers[device].pop()
+                    self._pending[device] = buffer
+                np.copyto(buffer, canvas)
+            if self._pending:
+                self._pending_cv.notify()
+
+        return finished_count
+
+    def blackout(self):
+        """
+        Removes every effect, sends all devices black and stops the sender.
+
+        The black frames go out through the same batched writes as any other
+        frame, so this costs one write per connection. Every device is sent
+        black, even one whose last frame was already black.
+        """
+        self.clear_all_effects()
+        self._last_sent.clear()
+        self._drew_last_frame[:] = [True] * len(self.devices)
+        self.update()
+        self.close()
+
+    def close(self):
+        """Sends any frames still pending and stops the sender thread."""
+        with self._pending_cv:
+            self._closing = True
+            self._pending_cv.notify()
+        self._sender.join()
+
+    def _send_loop(self):
+        """
+        Body of the sender thread. Waits for pending frames and writes the
+        newest one of each device to the hardware until `close()` is called.
+
+        All devices are sent from this one thread on purpose: the OpenRGB
+        client talks to the server over a single socket guarded by a lock,
+        so a thread per device would only queue on that lock.
+
+        Every zone and device on one connection, like the motherboard's ARGB
+        headers and the DRAM sticks, is batched: their packets are joined and
+        sent with one write. Zones keep their own UPDATEZONELEDS packets
+        rather than a device-wide UPDATELEDS one, which would also overwrite
+        zones this manager doesn't control.
+        """
+        while True:
+            with self._pending_cv:
+                while not self._pending and not self._closing:
+                    self._pending_cv.wait()
+                if not self._pending:
+                    return
+                frames, self._pending = self._pending, {}
+
+            try:
+                batches: dict[NetworkClient, list[bytes | np.ndarray]] = {}
+                for device, frame in frames.items():
+                    prefix = self._packet_prefixes.get(device)
+                    if prefix is not None:
+                        # Frames are already in the SDK's R, G, B, 0 color
+                        # layout, so their bytes are the packet's color data.
+                        # The join below reads the array through the buffer
+                        # protocol, so it is copied only once, into the packet.
+                        batch = batches.setdefault(device.comms, [])
+                        batch.append(prefix)
+                        batch.append(frame)
+                        continue
+
+                    # One fast set_colors per device is a single LED update
+                    # packet; without `fast` the client would also block on a
+                    # device-state round trip.
+                    pool = self._color_pools[device]
+                    # Unpack the R, G, B bytes of each LED. Converting the
+                    # channels as three flat lists, rather than one list per
+                    # LED, keeps the per-frame allocations independent of N.
+                    reds, greens, blues = (
+                        frame.view(np.uint8).reshape(-1, 4)[:, :3].T.tolist()
+                    )
+                    for color, red, green, blue in zip(pool, reds, greens, blues):
+                        color.red = red
+                        color.green = green
+                        color.blue = blue
+                    device.set_colors(pool, fast=True)
+
+                for comms, batch in batches.items():
+                    _send_raw(comms, b"".join(batch))
+
+                with self._pending_cv:
+                    for device, frame in frames.items():
+                        self._free_buffers[device].append(frame)
+            except Exception as e:
+                # Surface the failure on the render thread's next update().
+                self._sender_error = e
+                return
 
     def clear_all_effects(self):
         """Clears all effects from all devices managed by this StageManager."""
-        for device in self.devices:
-            self.clear_effects(device)
+        for effects in self._effects:
+            effects.clear()
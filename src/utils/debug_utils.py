@@ -1,15 +1,15 @@
 import os
 
-from logger_tt import logger, setup_logging
-
 DEBUG = os.environ.get("DEBUG", "0") == "1"
-LOGGING_SETUP = False
 
+if DEBUG:
+    # logger_tt is only needed when debugging, so it is only imported, and
+    # logging only set up, when DEBUG is on.
+    from logger_tt import logger, setup_logging
+
+    setup_logging(log_path="debug.log")
+    debug_print = logger.debug
+else:
 
-def debug_print(*args, **kwargs):
-    global LOGGING_SETUP
-    if DEBUG:
-        if not LOGGING_SETUP:
-            setup_logging(log_path="debug.log")
-            LOGGING_SETUP = True
-        logger.debug(*args, **kwargs)
+    def debug_print(*args, **kwargs):
+        """Does nothing; set DEBUG=1 to log debug messages instead."""
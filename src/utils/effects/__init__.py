@@ -1,4 +1,5 @@
-# from .neon_sign_flicker import NeonSignFlicker
+import importlib
+
 from .breathing import Breathing
 from .chase import Chase
 from .chase_ramp import ChaseRamp
@@ -12,11 +13,25 @@ from .color_source import (
 from .effect import Effect
 from .fade import FadeToBlack
 from .fade_in import FadeIn
-from .flicker_ramp import FlickerRamp
 from .liquid_fill import LiquidFill
-from .manual_ramp import ManualBrightnessRamp
 from .static import StaticBrightness
 
+# Effects the show doesn't use are only imported when first accessed.
+_LAZY_EFFECTS = {
+    "FlickerRamp": ".flicker_ramp",
+    "ManualBrightnessRamp": ".manual_ramp",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EFFECTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
 __all__ = [
     "Effect",
     "ColorSource",
@@ -1,7 +1,9 @@
 #
 # file: src/utils/effects/breathing.py (Upgraded)
 #
+import math
 import time
+from bisect import bisect_right
 from typing import Optional, Unpack
 
 import numpy as np
@@ -48,8 +50,10 @@ class Breathing(Effect):
         """
         super().__init__(rgb_container, color_source, **kwargs)
 
-        self.min_brightness = np.clip(min_brightness, 0.0, 1.0)
-        self.max_brightness = np.clip(max_brightness, 0.0, 1.0)
+        # Kept as Python floats: the wave is scalar math every frame, and
+        # NumPy scalars would make each of those operations slower.
+        self.min_brightness = float(np.clip(min_brightness, 0.0, 1.0))
+        self.max_brightness = float(np.clip(max_brightness, 0.0, 1.0))
         self.delay = delay
         self.duration = duration
         self.transition_duration = max(0.0, transition_duration)
@@ -70,6 +74,36 @@ class Breathing(Effect):
         if self.min_brightness > self.max_brightness:
             self.min_brightness = self.max_brightness
 
+        if self.mode == "trapezoid":
+            self._build_trapezoid_segments()
+
+    def _build_trapezoid_segments(self):
+        """
+        Precomputes the trapezoid as four linear segments, so each frame only
+        has to find its segment and evaluate `slope * t + intercept`.
+        """
+        # Define the key time points within one cycle
+        fade_in_end = self.transition_duration
+        on_phase_end = fade_in_end + self.on_duration
+        fade_out_end = on_phase_end + self.transition_duration
+        # The off_phase follows, up to cycle_duration
+        self._segment_ends = (fade_in_end, on_phase_end, fade_out_end)
+
+        # With no transition the ramps are empty segments that are never
+        # selected, so their coefficients don't matter.
+        ramp_slope = (
+            (self.max_brightness - self.min_brightness) / self.transition_duration
+            if self.transition_duration > 0
+            else 0.0
+        )
+        self._segment_slopes = (ramp_slope, 0.0, -ramp_slope, 0.0)
+        self._segment_intercepts = (
+            self.min_brightness,  # Phase 1: Fading In
+            self.max_brightness,  # Phase 2: Fully On
+            self.max_brightness + ramp_slope * on_phase_end,  # Phase 3: Fading Out
+            self.min_brightness,  # Phase 4: Fully Off
+        )
+
     def _update_brightness(self):
         """
         Calculates the uniform brightness for the current frame based on the
@@ -94,8 +128,10 @@ class Breathing(Effect):
 
     def _generate_cosine_wave(self, t: float) -> float:
         """Generates a smooth brightness value using a cosine wave."""
-        angle = t * (2 * np.pi) / self.cycle_duration
-        normalized_wave = (np.cos(angle) + 1) / 2.0
+        # math.cos on a float is exact and as fast as a table lookup, where
+        # np.cos would pay NumPy's scalar dispatch every frame.
+        angle = t * (2 * math.pi) / self.cycle_duration
+        normalized_wave = (math.cos(angle) + 1) / 2.0
         brightness_range = self.max_brightness - self.min_brightness
         return self.min_brightness + (normalized_wave * brightness_range)
 
@@ -107,39 +143,8 @@ class Breathing(Effect):
         # Find our position within the current cycle
         time_in_cycle = t % self.cycle_duration
 
-        # Define the key time points within one cycle
-        fade_in_end = self.transition_duration
-        on_phase_end = fade_in_end + self.on_duration
-        fade_out_end = on_phase_end + self.transition_duration
-        # The off_phase follows, up to cycle_duration
-
-        brightness = 0.0
-        if time_in_cycle < fade_in_end:
-            # Phase 1: Fading In
-            if self.transition_duration > 0:
-                progress = time_in_cycle / self.transition_duration
-                brightness = self.min_brightness + progress * (
-                    self.max_brightness - self.min_brightness
-                )
-            else:  # Instant on
-                brightness = self.max_brightness
-
-        elif time_in_cycle < on_phase_end:
-            # Phase 2: Fully On
-            brightness = self.max_brightness
-
-        elif time_in_cycle < fade_out_end:
-            # Phase 3: Fading Out
-            if self.transition_duration > 0:
-                progress = (time_in_cycle - on_phase_end) / self.transition_duration
-                brightness = self.max_brightness - progress * (
-                    self.max_brightness - self.min_brightness
-                )
-            else:  # Instant off
-                brightness = self.min_brightness
-
-        else:
-            # Phase 4: Fully Off
-            brightness = self.min_brightness
-
-        return brightness
+        segment = bisect_right(self._segment_ends, time_in_cycle)
+        return (
+            self._segment_slopes[segment] * time_in_cycle
+            + self._segment_intercepts[segment]
+        )
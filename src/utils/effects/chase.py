@@ -2,6 +2,7 @@
 # file: src/utils/effects/chase.py (Improved)
 #
 import time
+from functools import lru_cache
 from typing import Optional, Unpack
 
 import numpy as np
@@ -10,6 +11,29 @@ from .color_source import ColorSource
 from .effect import Effect, EffectOptionsKwargs
 
 
+@lru_cache(maxsize=None)
+def _padded_pattern(
+    num_leds: int, width: int, resolution_multiplier: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Builds the high-res comet pattern and a zero-padded strip holding it once,
+    between two runs of zeros as long as the high-res canvas. Every frame's
+    canvas is just a window into the strip, so nothing is cleared or stamped
+    per frame.
+
+    Chases with the same geometry share the returned arrays, so both are
+    read-only; the pattern is a view into the strip.
+    """
+    high_res_width = width * resolution_multiplier
+    high_res_led_count = num_leds * resolution_multiplier
+    padded = np.zeros(2 * high_res_led_count + high_res_width, dtype=np.float32)
+    pattern = padded[high_res_led_count : high_res_led_count + high_res_width]
+    pattern[:] = np.linspace(1.0, 0.0, num=high_res_width, dtype=np.float32)
+    padded.flags.writeable = False
+    pattern.flags.writeable = False
+    return pattern, padded
+
+
 class Chase(Effect):
     """
     A "comet" or "chase" effect with a bright head and a tapering tail that
@@ -51,11 +75,15 @@ class Chase(Effect):
         self._loop_start_time: Optional[float] = None
 
         # --- NEW: Create a high-resolution pattern for smooth stamping ---
-        high_res_width = self.width * self.resolution_multiplier
-        self.high_res_pattern = np.linspace(
-            1.0, 0.0, num=high_res_width, dtype=np.float32
+        self.high_res_pattern, self._padded_pattern = _padded_pattern(
+            self.num_leds, self.width, self.resolution_multiplier
         )
 
+    def reset(self):
+        """Restarts the chase, including its initial delay."""
+        super().reset()
+        self._loop_start_time = None
+
     def _update_brightness(self):
         """
         Calculates the sub-pixel position of the chase and renders it to a
@@ -89,33 +117,34 @@ class Chase(Effect):
 
         # --- NEW: High-Resolution Rendering Logic ---
 
-        # 4. Create a high-resolution canvas to draw on.
+        # 4. Calculate the comet's head position in the high-res space.
         high_res_led_count = self.num_leds * self.resolution_multiplier
-        high_res_canvas = np.zeros(high_res_led_count, dtype=np.float32)
-
-        # 5. Calculate the comet's head position in the high-res space.
         high_res_head_pos = head_position * self.resolution_multiplier
         int_head_pos = int(high_res_head_pos)
 
-        # 6. "Stamp" the high-res pattern onto the high-res canvas.
-        #    This is the same slicing logic as before, but with high-res variables.
-        target_start = int_head_pos - len(self.high_res_pattern)
-        target_end = int_head_pos
-
-        write_start = max(0, target_start)
-        write_end = min(high_res_led_count, target_end)
-
-        if write_start < write_end:
-            read_start = write_start - target_start
-            read_end = write_end - target_start
-            high_res_canvas[write_start:write_end] = self.high_res_pattern[
-                read_start:read_end
-            ]
+        # 5. Take the high-res canvas as a window into the padded pattern. The
+        #    pattern ends at the head, so the window starts where the pattern
+        #    sits relative to it; whatever is off-canvas falls in the padding.
+        pattern_len = len(self.high_res_pattern)
+        window_start = min(
+            max(high_res_led_count + pattern_len - int_head_pos, 0),
+            high_res_led_count + pattern_len,
+        )
+        high_res_canvas = self._padded_pattern[
+            window_start : window_start + high_res_led_count
+        ]
 
-        # 7. Downsample the high-res canvas to the final brightness array.
+        # 6. Downsample the high-res canvas to the final brightness array.
         #    We do this by reshaping the canvas and averaging each block of
-        #    high-res pixels that corresponds to a single real LED.
+        #    high-res pixels that corresponds to a single real LED. The sum
+        #    and divide are the two ufunc calls np.mean makes, without its
+        #    Python-level argument handling.
         reshaped_canvas = high_res_canvas.reshape(
             self.num_leds, self.resolution_multiplier
         )
-        np.mean(reshaped_canvas, axis=1, out=self.brightness_array)
+        np.add.reduce(reshaped_canvas, axis=1, out=self.brightness_array)
+        np.divide(
+            self.brightness_array,
+            self.resolution_multiplier,
+            out=self.brightness_array,
+        )
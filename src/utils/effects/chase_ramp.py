@@ -7,7 +7,7 @@ from typing import Unpack
 import numpy as np
 
 from .color_source import ColorSource
-from .effect import Effect, EffectOptionsKwargs
+from .effect import _RNG, Effect, EffectOptionsKwargs
 
 
 class ChaseRamp(Effect):
@@ -62,6 +62,31 @@ class ChaseRamp(Effect):
         self._is_finishing = False
         self._finish_start_time: float | None = None
 
+        # Rendering buffers reused across frames.
+        self._high_res_canvas = np.zeros(
+            self.num_leds * self.resolution_multiplier, dtype=np.float32
+        )
+        self._flicker_noise = np.zeros(self.num_leds, dtype=np.float32)
+        # The comet's width only moves between its initial and max widths, so
+        # build the pattern for every high-res width it can take up front.
+        min_width, max_width = sorted((self.initial_width, self.max_width))
+        self._high_res_patterns = {
+            width: np.linspace(1.0, 0.0, num=width, dtype=np.float32)
+            for width in range(
+                int(min_width * self.resolution_multiplier),
+                int(max_width * self.resolution_multiplier) + 1,
+            )
+        }
+
+    def reset(self):
+        """Restarts the ramp from its initial speed, off-screen."""
+        super().reset()
+        self.current_speed = self.initial_speed
+        self.head_position = -self.initial_width
+        self._last_update_time = self.start_time
+        self._is_finishing = False
+        self._finish_start_time = None
+
     def _update_brightness(self):
         """
         Calculates the comet's new position and width, handles the finishing
@@ -97,9 +122,8 @@ class ChaseRamp(Effect):
         # 4. Calculate Dynamic Width
         speed_progress = 0.0
         if speed_range > 0:
-            speed_progress = np.clip(
-                (self.current_speed - self.initial_speed) / speed_range, 0.0, 1.0
-            )
+            progress = (self.current_speed - self.initial_speed) / speed_range
+            speed_progress = max(0.0, min(1.0, progress))
         current_width = (
             self.initial_width + (self.max_width - self.initial_width) * speed_progress
         )
@@ -109,23 +133,30 @@ class ChaseRamp(Effect):
         high_res_width = int(current_width * self.resolution_multiplier)
         high_res_head_pos = self.head_position * self.resolution_multiplier
 
-        high_res_pattern = np.linspace(1.0, 0.0, num=high_res_width, dtype=np.float32)
-        high_res_canvas = np.zeros(high_res_leds, dtype=np.float32)
+        high_res_pattern = self._high_res_patterns[high_res_width]
 
+        # Stamp the pattern at the head's position on the circular canvas.
+        # This is what rolling a canvas with the pattern at its start would
+        # give, written as at most two slice copies instead of np.roll.
+        high_res_canvas = self._high_res_canvas
+        high_res_canvas.fill(0.0)
         stamp_len = min(high_res_width, high_res_leds)
-        high_res_canvas[:stamp_len] = high_res_pattern[:stamp_len]
-
-        rolled_canvas = np.roll(high_res_canvas, int(high_res_head_pos))
+        shift = int(high_res_head_pos) % high_res_leds
+        first_len = min(stamp_len, high_res_leds - shift)
+        high_res_canvas[shift : shift + first_len] = high_res_pattern[:first_len]
+        high_res_canvas[: stamp_len - first_len] = high_res_pattern[first_len:stamp_len]
 
         # 6. Downsample using MAX for a bright, anti-aliased look
-        reshaped_canvas = rolled_canvas.reshape(
+        reshaped_canvas = high_res_canvas.reshape(
             self.num_leds, self.resolution_multiplier
         )
         np.max(reshaped_canvas, axis=1, out=self.brightness_array)
 
         # 7. Final "flicker" state enhancement
         if self._is_finishing and self.options.dither_strength > 0:
-            noise = np.random.uniform(
-                0, self.options.dither_strength, self.brightness_array.shape
-            )
-            self.brightness_array = np.clip(self.brightness_array + noise, 0, 1)
+            noise = self._flicker_noise
+            _RNG.random(dtype=np.float32, out=noise)
+            noise *= self.options.dither_strength
+            # In place, so brightness_array stays the buffer the base class owns.
+            np.add(self.brightness_array, noise, out=self.brightness_array)
+            np.clip(self.brightness_array, 0.0, 1.0, out=self.brightness_array)
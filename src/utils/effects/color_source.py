@@ -1,11 +1,59 @@
 #
 # file: color_source.py (Fully Updated)
 #
+import colorsys
 import time
-from typing import List
+from functools import lru_cache
+from typing import List, Optional
 
 import numpy as np
 
+# Number of entries in the precomputed lookup table of a MultiGradient.
+GRADIENT_LUT_SIZE = 1024
+
+
+def _unwrap_hues(hues: np.ndarray) -> np.ndarray:
+    """Adjusts hues for correct circular interpolation across the 0.0/1.0 boundary."""
+    unwrapped = np.copy(hues)
+    for i in range(1, len(unwrapped)):
+        diff = unwrapped[i] - unwrapped[i - 1]
+        if diff > 0.5:
+            unwrapped[i:] -= 1.0
+        elif diff < -0.5:
+            unwrapped[i:] += 1.0
+    return unwrapped
+
+
+# Per-channel phase offsets (in hue sextants) for R, G and B.
+_HSV_CHANNEL_OFFSETS = np.array([5.0, 3.0, 1.0], dtype=np.float32)
+
+
+def hsv_to_rgb(hues: np.ndarray, sats: np.ndarray, vals: np.ndarray) -> np.ndarray:
+    """
+    Converts H, S and V arrays to an (N, 3) float RGB array.
+
+    Uses the branchless form f(n) = V - V*S*clip(min(k, 4 - k), 0, 1) with
+    k = (n + 6H) mod 6, so there is no per-sextant selection at all.
+    """
+    k = (hues[:, np.newaxis] * 6.0 + _HSV_CHANNEL_OFFSETS) % 6.0
+    ramp = np.clip(np.minimum(k, 4.0 - k), 0.0, 1.0)
+    return vals[:, np.newaxis] * (1.0 - sats[:, np.newaxis] * ramp)
+
+
+# Cached arrays of static palettes, shared by every source that describes the
+# same colors. Keyed on (type, palette, num_leds, reverse).
+_SHARED_HSV: dict[tuple, tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+_SHARED_RGB: dict[tuple, np.ndarray] = {}
+
+
+@lru_cache(maxsize=None)
+def _full_value_rgb(hue: float, sat: float) -> np.ndarray:
+    """Converts a hue and saturation to a shared, read-only full-value RGB color."""
+    rgb = np.array(colorsys.hsv_to_rgb(hue, sat, 1.0), dtype=np.float32)
+    rgb.flags.writeable = False
+    return rgb
+
+
 # ==============================================================================
 #  Base Class with HSV Caching and Reversal
 # ==============================================================================
@@ -17,6 +65,10 @@ class ColorSource:
     Provides full HSV (Hue, Saturation, Value) data.
     """
 
+    # True for sources whose colors never change over time. Effects fetch the
+    # colors of a static source once instead of on every frame.
+    is_static: bool = False
+
     def __init__(self, reverse: bool = False):
         """
         Initializes the ColorSource.
@@ -24,42 +76,80 @@ class ColorSource:
         Args:
             reverse: If True, the generated color map will be spatially reversed.
         """
-        self._hues: dict[int, np.ndarray] = {}
-        self._sats: dict[int, np.ndarray] = {}
-        self._vals: dict[int, np.ndarray] = {}  # Cache for Value/Brightness
+        # Keyed on (num_leds, reverse), with the reversal already applied, so
+        # the arrays handed out are contiguous and built once per layout.
+        self._cache: dict[
+            tuple[int, bool], tuple[np.ndarray, np.ndarray, np.ndarray]
+        ] = {}
+        # Full-value RGB converted from the cached hues and saturations.
+        self._full_rgb: dict[tuple[int, bool], np.ndarray] = {}
         self.reverse = reverse
 
-    def _generate_arrays(
-        self, num_leds: int
-    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
-        """Subclasses must implement this to generate H, S, and V arrays."""
+    def _generate_arrays(self, num_leds: int) -> np.ndarray:
+        """
+        Subclasses must implement this to generate a (3, N) array whose rows
+        are the H, S, and V arrays.
+        """
         raise NotImplementedError
 
+    def _palette_key(self) -> Optional[tuple]:
+        """
+        Returns a hashable description of the colors, for sources whose arrays
+        depend on nothing else. Sources with equal keys share one copy of the
+        cached arrays. None keeps the cache private to this instance.
+        """
+        return None
+
+    def _shared_key(self, num_leds: int) -> Optional[tuple]:
+        palette = self._palette_key()
+        if palette is None:
+            return None
+        return type(self), palette, num_leds, self.reverse
+
     def get_hsv_arrays(
         self, num_leds: int
     ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
         """Public method to get all three HSV arrays, with caching and reversal."""
-        if num_leds not in self._hues:
-            # Generate and cache the arrays in their default (non-reversed) order
-            hues, sats, vals = self._generate_arrays(num_leds)
-            self._hues[num_leds] = hues
-            self._sats[num_leds] = sats
-            self._vals[num_leds] = vals
-
-        # Retrieve the canonical arrays from the cache
-        hues_to_return = self._hues[num_leds]
-        sats_to_return = self._sats[num_leds]
-        vals_to_return = self._vals[num_leds]
-
-        # Apply reversal if the flag is set
-        if self.reverse:
-            return (
-                np.flip(hues_to_return),
-                np.flip(sats_to_return),
-                np.flip(vals_to_return),
-            )
+        key = (num_leds, self.reverse)
+        entry = self._cache.get(key)
+        if entry is None:
+            shared_key = self._shared_key(num_leds)
+            entry = _SHARED_HSV.get(shared_key)
+            if entry is None:
+                # The channels are rows of one (3, N) buffer, which may be
+                # shared, so it is read-only.
+                hsv = np.asarray(self._generate_arrays(num_leds), dtype=np.float32)
+                if self.reverse:
+                    hsv = np.ascontiguousarray(hsv[:, ::-1])
+                hsv.flags.writeable = False
+                entry = (hsv[0], hsv[1], hsv[2])
+                if shared_key is not None:
+                    _SHARED_HSV[shared_key] = entry
+            self._cache[key] = entry
+        return entry
+
+    def get_rgb_arrays(self, num_leds: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the colors as an (N, 3) RGB array at full value, plus the V array.
 
-        return hues_to_return, sats_to_return, vals_to_return
+        RGB scales linearly with V, so effects can apply their brightness to
+        the full-value colors directly instead of converting HSV every frame.
+        The arrays cached by `get_hsv_arrays` never change, so each layout is
+        converted once and the read-only result is reused.
+        """
+        hues, sats, vals = self.get_hsv_arrays(num_leds)
+        key = (num_leds, self.reverse)
+        rgb = self._full_rgb.get(key)
+        if rgb is None:
+            shared_key = self._shared_key(num_leds)
+            rgb = _SHARED_RGB.get(shared_key)
+            if rgb is None:
+                rgb = hsv_to_rgb(hues, sats, np.ones(num_leds, dtype=np.float32))
+                rgb.flags.writeable = False
+                if shared_key is not None:
+                    _SHARED_RGB[shared_key] = rgb
+            self._full_rgb[key] = rgb
+        return rgb, vals
 
 
 # ==============================================================================
@@ -70,22 +160,32 @@ class ColorSource:
 class StaticColor(ColorSource):
     """A color source representing a single, uniform HSV color."""
 
+    is_static = True
+
     def __init__(self, hsv: tuple[float, float, float], reverse: bool = False):
         super().__init__(reverse=reverse)
         self.hue, self.sat, self.val = hsv
+        # The color never changes, so convert it once.
+        self._rgb = _full_value_rgb(self.hue, self.sat)
 
-    def _generate_arrays(
-        self, num_leds: int
-    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
-        hues = np.full(num_leds, self.hue, dtype=np.float32)
-        sats = np.full(num_leds, self.sat, dtype=np.float32)
-        vals = np.full(num_leds, self.val, dtype=np.float32)
-        return hues, sats, vals
+    def get_rgb_arrays(self, num_leds: int) -> tuple[np.ndarray, np.ndarray]:
+        _, _, vals = self.get_hsv_arrays(num_leds)
+        return np.broadcast_to(self._rgb, (num_leds, 3)), vals
+
+    def _palette_key(self) -> Optional[tuple]:
+        return self.hue, self.sat, self.val
+
+    def _generate_arrays(self, num_leds: int) -> np.ndarray:
+        # One column broadcast across the strip; nothing is allocated per LED.
+        hsv = np.array([[self.hue], [self.sat], [self.val]], dtype=np.float32)
+        return np.broadcast_to(hsv, (3, num_leds))
 
 
 class Gradient(ColorSource):
     """A color source representing a linear gradient between two HSV colors."""
 
+    is_static = True
+
     def __init__(
         self,
         start_hsv: tuple[float, float, float],
@@ -103,51 +203,42 @@ class Gradient(ColorSource):
         self.start_pos = min(start_pos_clamped, end_pos_clamped)
         self.end_pos = max(start_pos_clamped, end_pos_clamped)
 
-    def _generate_arrays(
-        self, num_leds: int
-    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    def _palette_key(self) -> Optional[tuple]:
+        return (
+            (self.start_hue, self.start_sat, self.start_val),
+            (self.end_hue, self.end_sat, self.end_val),
+            self.start_pos,
+            self.end_pos,
+        )
+
+    def _generate_arrays(self, num_leds: int) -> np.ndarray:
         if num_leds == 0:
-            return np.array([]), np.array([]), np.array([])
+            return np.empty((3, 0), dtype=np.float32)
 
         start_idx = round(self.start_pos * (num_leds - 1))
         end_idx = round(self.end_pos * (num_leds - 1))
 
-        num_start_solid = start_idx
-        start_hues = np.full(num_start_solid, self.start_hue, dtype=np.float32)
-        start_sats = np.full(num_start_solid, self.start_sat, dtype=np.float32)
-        start_vals = np.full(num_start_solid, self.start_val, dtype=np.float32)
+        start_hsv = np.array([self.start_hue, self.start_sat, self.start_val])
+        end_hsv = np.array([self.end_hue, self.end_sat, self.end_val])
 
+        # Fill one (3, N) buffer in place: solid start, gradient, solid end.
+        # The ramp is a single linspace over all three channels at once.
+        final = np.empty((3, num_leds), dtype=np.float32)
+        final[:, :start_idx] = start_hsv[:, np.newaxis]
         gradient_width = end_idx - start_idx
         if gradient_width > 0:
-            gradient_hues = np.linspace(
-                self.start_hue, self.end_hue, num=gradient_width, dtype=np.float32
-            )
-            gradient_sats = np.linspace(
-                self.start_sat, self.end_sat, num=gradient_width, dtype=np.float32
+            final[:, start_idx:end_idx] = np.linspace(
+                start_hsv, end_hsv, num=gradient_width, axis=1
             )
-            gradient_vals = np.linspace(
-                self.start_val, self.end_val, num=gradient_width, dtype=np.float32
-            )
-        else:
-            gradient_hues, gradient_sats, gradient_vals = (
-                np.array([], dtype=np.float32),
-            ) * 3
-
-        num_end_solid = num_leds - end_idx
-        end_hues = np.full(num_end_solid, self.end_hue, dtype=np.float32)
-        end_sats = np.full(num_end_solid, self.end_sat, dtype=np.float32)
-        end_vals = np.full(num_end_solid, self.end_val, dtype=np.float32)
-
-        final_hues = np.concatenate((start_hues, gradient_hues, end_hues))
-        final_sats = np.concatenate((start_sats, gradient_sats, end_sats))
-        final_vals = np.concatenate((start_vals, gradient_vals, end_vals))
-
-        return final_hues, final_sats, final_vals
+        final[:, end_idx:] = end_hsv[:, np.newaxis]
+        return final
 
 
 class MultiGradient(ColorSource):
     """A color source representing a gradient between multiple HSV color stops."""
 
+    is_static = True
+
     def __init__(
         self,
         stops: List[tuple[tuple[float, float, float], float]],
@@ -156,61 +247,91 @@ class MultiGradient(ColorSource):
         super().__init__(reverse=reverse)
         if not stops:
             self.stops = []
+            self._stop_hsvs = np.zeros((0, 3))
+            self._lut = np.zeros((GRADIENT_LUT_SIZE, 3), dtype=np.float32)
+            self._rgb_lut = np.zeros((GRADIENT_LUT_SIZE, 3), dtype=np.float32)
             return
         sanitized_stops = []
         for hsv, pos in stops:
             clamped_pos = max(0.0, min(1.0, pos))
             sanitized_stops.append((hsv, clamped_pos))
         self.stops = sorted(sanitized_stops, key=lambda stop: stop[1])
+        # The stop colors as one (M, 3) array, so segments are built row-wise.
+        self._stop_hsvs = np.array([hsv for hsv, pos in self.stops], dtype=np.float64)
+
+        # Pay for the stop search and interpolation once, up front. The table
+        # is also baked to full-value RGB so samplers skip HSV conversion.
+        self._lut = self._build_lut(GRADIENT_LUT_SIZE)
+        self._rgb_lut = hsv_to_rgb(
+            self._lut[:, 0], self._lut[:, 1], np.ones(GRADIENT_LUT_SIZE, np.float32)
+        )
+
+        # Gradients are shared module-wide, so guard the baked tables against
+        # accidental in-place writes through a sampled row.
+        self._lut.flags.writeable = False
+        self._rgb_lut.flags.writeable = False
+
+    def _build_lut(self, size: int) -> np.ndarray:
+        """
+        Samples the gradient at `size` evenly spaced positions into a (size, 3)
+        HSV table. Hues follow the shortest path around the color wheel.
+        """
+        positions = np.array([pos for hsv, pos in self.stops])
+        hsvs = self._stop_hsvs
+        grid = np.linspace(0.0, 1.0, num=size)
 
-    def _generate_arrays(
-        self, num_leds: int
-    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
-        if num_leds == 0:
-            return np.array([]), np.array([]), np.array([])
-        if not self.stops:
-            return (np.zeros(num_leds, dtype=np.float32),) * 3  # type: ignore
-        if len(self.stops) == 1:
-            h, s, v = self.stops[0][0]
-            return np.full(num_leds, h), np.full(num_leds, s), np.full(num_leds, v)
+        lut = np.empty((size, 3), dtype=np.float32)
+        lut[:, 0] = np.interp(grid, positions, _unwrap_hues(hsvs[:, 0])) % 1.0
+        lut[:, 1] = np.interp(grid, positions, hsvs[:, 1])
+        lut[:, 2] = np.interp(grid, positions, hsvs[:, 2])
+        return lut
+
+    def _palette_key(self) -> Optional[tuple]:
+        return tuple((tuple(hsv), pos) for hsv, pos in self.stops)
 
-        all_hues, all_sats, all_vals = [], [], []
+    def sample(self, position: float) -> np.ndarray:
+        """Returns the (H, S, V) color at `position` (0.0-1.0) via a single table lookup."""
+        return self._lut[int(position * (GRADIENT_LUT_SIZE - 1) + 0.5)]
 
-        first_hsv, first_pos = self.stops[0]
-        first_idx = round(first_pos * (num_leds - 1))
-        all_hues.append(np.full(first_idx, first_hsv[0]))
-        all_sats.append(np.full(first_idx, first_hsv[1]))
-        all_vals.append(np.full(first_idx, first_hsv[2]))
+    def sample_rgb(self, position: float) -> tuple[np.ndarray, float]:
+        """Returns the full-value RGB color and the V at `position` (0.0-1.0)."""
+        index = int(position * (GRADIENT_LUT_SIZE - 1) + 0.5)
+        return self._rgb_lut[index], self._lut[index, 2]
 
+    def _generate_arrays(self, num_leds: int) -> np.ndarray:
+        if not self.stops:
+            return np.zeros((3, num_leds), dtype=np.float32)
+        stop_hsvs = self._stop_hsvs
+        if len(self.stops) == 1 or num_leds == 0:
+            final = np.empty((3, num_leds), dtype=np.float32)
+            final[:] = stop_hsvs[0, :, np.newaxis]
+            return final
+
+        # Describe the map as knots for np.interp: each segment runs from its
+        # start stop on its first LED to its end stop on its last LED, and
+        # np.interp holds the first and last stops constant past the ends.
+        indices = [round(pos * (num_leds - 1)) for hsv, pos in self.stops]
+        knot_leds, knot_stops = [], []
+        if indices[0] > 0:
+            knot_leds.append(indices[0] - 1)
+            knot_stops.append(0)
         for i in range(len(self.stops) - 1):
-            start_hsv, start_pos = self.stops[i]
-            end_hsv, end_pos = self.stops[i + 1]
-            start_idx = round(start_pos * (num_leds - 1))
-            end_idx = round(end_pos * (num_leds - 1))
-            width = end_idx - start_idx
+            width = indices[i + 1] - indices[i]
             if width > 0:
-                all_hues.append(np.linspace(start_hsv[0], end_hsv[0], num=width))
-                all_sats.append(np.linspace(start_hsv[1], end_hsv[1], num=width))
-                all_vals.append(np.linspace(start_hsv[2], end_hsv[2], num=width))
-
-        last_hsv, last_pos = self.stops[-1]
-        last_idx = round(last_pos * (num_leds - 1))
-        num_end = num_leds - last_idx
-        if num_end > 0:
-            all_hues.append(np.full(num_end, last_hsv[0]))
-            all_sats.append(np.full(num_end, last_hsv[1]))
-            all_vals.append(np.full(num_end, last_hsv[2]))
-
-        final_hues = np.concatenate(all_hues).astype(np.float32)
-        final_sats = np.concatenate(all_sats).astype(np.float32)
-        final_vals = np.concatenate(all_vals).astype(np.float32)
-
-        if len(final_hues) != num_leds:
-            final_hues.resize(num_leds, refcheck=False)
-            final_sats.resize(num_leds, refcheck=False)
-            final_vals.resize(num_leds, refcheck=False)
-
-        return final_hues, final_sats, final_vals
+                knot_leds.append(indices[i])
+                knot_stops.append(i)
+            if width > 1:
+                knot_leds.append(indices[i + 1] - 1)
+                knot_stops.append(i + 1)
+        knot_leds.append(indices[-1])
+        knot_stops.append(len(self.stops) - 1)
+
+        knot_hsvs = stop_hsvs[knot_stops]
+        leds = np.arange(num_leds)
+        final = np.empty((3, num_leds), dtype=np.float32)
+        for channel in range(3):
+            final[channel] = np.interp(leds, knot_leds, knot_hsvs[:, channel])
+        return final
 
 
 # ==============================================================================
@@ -259,44 +380,58 @@ class ScrollingColorSource(ColorSource):
         self.mirrored = mirrored
         self.resolution_multiplier = max(1, resolution_multiplier)
         self._start_time = time.monotonic()
-        self._base_hues: dict[int, np.ndarray] = {}
-        self._base_sats: dict[int, np.ndarray] = {}
-        self._base_vals: dict[int, np.ndarray] = {}
+        self._base_hsv: dict[int, np.ndarray] = {}
+        self._base_rgb: dict[int, np.ndarray] = {}
+        self._base_periods: dict[int, int] = {}
+        self._base_rolls: dict[int, int] = {}
+        # The last get_hsv_arrays and get_rgb_arrays results per LED count,
+        # with the samples and reverse flag they were read with.
+        self._last_hsv: dict[int, tuple[slice, bool, tuple[np.ndarray, ...]]] = {}
+        self._last_rgb: dict[int, tuple[slice, bool, tuple[np.ndarray, ...]]] = {}
+
+    def reset(self):
+        """Resets the animation's start time to the current moment."""
+        self._start_time = time.monotonic()
 
     def _generate_base_arrays(self, num_leds: int):
         """Generates a high-resolution, mirrored/tiled base map."""
         cache_key = num_leds * self.resolution_multiplier
-        if cache_key not in self._base_hues:
+        if cache_key not in self._base_hsv:
             high_res_led_count = num_leds * self.resolution_multiplier
-            h, s, v = self.source.get_hsv_arrays(high_res_led_count)
-
+            # A mirrored map runs forward, then back without repeating its ends.
+            period = high_res_led_count
             if self.mirrored:
-                h = np.concatenate((h, np.flip(h[1:-1])))
-                s = np.concatenate((s, np.flip(s[1:-1])))
-                v = np.concatenate((v, np.flip(v[1:-1])))
-
-            roll_amt = int(len(h) * self.initial_roll_ratio)
-            if roll_amt:
-                h = np.roll(h, roll_amt)
-                s = np.roll(s, roll_amt)
-                v = np.roll(v, roll_amt)
-
-            self._base_hues[cache_key] = h
-            self._base_sats[cache_key] = s
-            self._base_vals[cache_key] = v
-
-    def get_hsv_arrays(
-        self, num_leds: int
-    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
-        if num_leds <= 0:
-            return (np.array([]),) * 3  # type: ignore
-
-        self._generate_base_arrays(num_leds)
-        cache_key = num_leds * self.resolution_multiplier
-        base_hues = self._base_hues[cache_key]
-        base_sats = self._base_sats[cache_key]
-        base_vals = self._base_vals[cache_key]
+                period = max(period, 2 * high_res_led_count - 2)
+
+            # Store the map twice over so any scroll offset, reduced modulo
+            # the period, can be read as one strided slice without wrapping.
+            # Each part is written straight into the one buffer.
+            base_hsv = np.empty((3, 2 * period), dtype=np.float32)
+            channels = self.source.get_hsv_arrays(high_res_led_count)
+            for row, channel in zip(base_hsv, channels):
+                row[:high_res_led_count] = channel
+            if self.mirrored:
+                base_hsv[:, high_res_led_count:period] = base_hsv[
+                    :, high_res_led_count - 2 : 0 : -1
+                ]
+            base_hsv[:, period:] = base_hsv[:, :period]
+
+            # The initial roll is applied as a fixed phase offset when the map
+            # is read, rather than by rolling (copying) the arrays.
+            self._base_rolls[cache_key] = int(period * self.initial_roll_ratio)
+            self._base_periods[cache_key] = period
+            self._base_hsv[cache_key] = base_hsv
+
+            # The map never changes, so bake it to full-value RGB once.
+            self._base_rgb[cache_key] = hsv_to_rgb(
+                base_hsv[0], base_hsv[1], np.ones(2 * period, dtype=np.float32)
+            )
 
+    def _scroll_samples(self, num_leds: int) -> slice:
+        """
+        Returns the slice of the doubled base map that lands on the LEDs at
+        the current scroll position.
+        """
         time_since_start = max(0, (time.monotonic() - self._start_time) - self.delay)
         total_offset_float = 0.0
 
@@ -325,24 +460,63 @@ class ScrollingColorSource(ColorSource):
             )
             total_offset_float = dist_past + dist_current
 
-        high_res_offset = total_offset_float * self.resolution_multiplier
+        # Quantize the scroll position to an integer index into the base map
+        # once per frame; the LEDs are then a strided view of the map, with
+        # no per-LED arithmetic at all.
+        cache_key = num_leds * self.resolution_multiplier
+        start = (
+            int(total_offset_float * self.resolution_multiplier)
+            - self._base_rolls[cache_key]
+        ) % self._base_periods[cache_key]
+        return slice(start, start + cache_key, self.resolution_multiplier)
+
+    def get_hsv_arrays(
+        self, num_leds: int
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if num_leds <= 0:
+            return (np.array([]),) * 3  # type: ignore
+
+        self._generate_base_arrays(num_leds)
+        cache_key = num_leds * self.resolution_multiplier
+        samples = self._scroll_samples(num_leds)
+
+        last = self._last_hsv.get(num_leds)
+        if last is not None and last[0] == samples and last[1] == self.reverse:
+            return last[2]  # type: ignore
+
+        final_hsv = self._base_hsv[cache_key][:, samples]
+
+        if self.reverse:
+            final_hsv = final_hsv[:, ::-1]
+
+        result = (final_hsv[0], final_hsv[1], final_hsv[2])
+        self._last_hsv[num_leds] = (samples, self.reverse, result)
+        return result
 
-        rolled_h = np.roll(base_hues, -int(high_res_offset))
-        rolled_s = np.roll(base_sats, -int(high_res_offset))
-        rolled_v = np.roll(base_vals, -int(high_res_offset))
+    def get_rgb_arrays(self, num_leds: int) -> tuple[np.ndarray, np.ndarray]:
+        """Reads the colors straight from the pre-baked full-value RGB map."""
+        if num_leds <= 0:
+            return np.zeros((0, 3), dtype=np.float32), np.array([])
 
-        # --- THE FIX IS HERE ---
-        # After downsampling, we must slice the result to exactly num_leds to
-        # guarantee the output shape is correct.
-        final_hues = rolled_h[:: self.resolution_multiplier][:num_leds]
-        final_sats = rolled_s[:: self.resolution_multiplier][:num_leds]
-        final_vals = rolled_v[:: self.resolution_multiplier][:num_leds]
-        # --- END OF FIX ---
+        self._generate_base_arrays(num_leds)
+        cache_key = num_leds * self.resolution_multiplier
+        samples = self._scroll_samples(num_leds)
+
+        # While the map is paused, or scrolling slower than the frame rate,
+        # consecutive frames read the same samples; reuse the last views.
+        last = self._last_rgb.get(num_leds)
+        if last is not None and last[0] == samples and last[1] == self.reverse:
+            return last[2]  # type: ignore
+
+        final_rgb = self._base_rgb[cache_key][samples]
+        final_vals = self._base_hsv[cache_key][2, samples]
 
         if self.reverse:
-            return np.flip(final_hues), np.flip(final_sats), np.flip(final_vals)
+            final_rgb, final_vals = final_rgb[::-1], final_vals[::-1]
 
-        return final_hues, final_sats, final_vals
+        result = (final_rgb, final_vals)
+        self._last_rgb[num_leds] = (samples, self.reverse, result)
+        return result
 
 
 class ColorShift(ColorSource):
@@ -379,39 +553,12 @@ class ColorShift(ColorSource):
         self.cycle_duration = max(0.1, cycle_duration)
         self.delay = delay
 
-        # --- Pre-process the gradient for fast interpolation ---
-        # We extract the stops into separate numpy arrays for use with np.interp
-
-        # Sort stops by position to be safe, though they should be already.
-        sorted_stops = sorted(gradient_source.stops, key=lambda s: s[1])
-
-        self.positions = np.array([pos for hsv, pos in sorted_stops])
-        hues = [hsv[0] for hsv, pos in sorted_stops]
-        sats = [hsv[1] for hsv, pos in sorted_stops]
-        vals = [hsv[2] for hsv, pos in sorted_stops]
-
-        # To handle circular hue interpolation, we need to check if the path
-        # crosses the 0.0/1.0 boundary and adjust.
-        self.hues = self._unwrap_hues(np.array(hues))
-        self.sats = np.array(sats)
-        self.vals = np.array(vals)
         self._start_time = time.monotonic()
 
     def reset(self):
         """Resets the animation's start time to the current moment."""
         self._start_time = time.monotonic()
 
-    def _unwrap_hues(self, hues: np.ndarray) -> np.ndarray:
-        """Adjusts hues for correct circular interpolation across the 0.0/1.0 boundary."""
-        unwrapped = np.copy(hues)
-        for i in range(1, len(unwrapped)):
-            diff = unwrapped[i] - unwrapped[i - 1]
-            if diff > 0.5:
-                unwrapped[i:] -= 1.0
-            elif diff < -0.5:
-                unwrapped[i:] += 1.0
-        return unwrapped
-
     def get_hsv_arrays(
         self, num_leds: int
     ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
@@ -427,10 +574,8 @@ class ColorShift(ColorSource):
         #    We use modulo to make the progress loop.
         progress = (time_since_start / self.cycle_duration) % 1.0
 
-        # 3. Interpolate to find the current H, S, and V values.
-        current_hue = np.interp(progress, self.positions, self.hues) % 1.0
-        current_sat = np.interp(progress, self.positions, self.sats)
-        current_val = np.interp(progress, self.positions, self.vals)
+        # 3. Look up the current H, S, and V values in the gradient's table.
+        current_hue, current_sat, current_val = self.gradient_source.sample(progress)
 
         # 4. Create the final arrays by filling them with the uniform color.
         hues = np.full(num_leds, current_hue, dtype=np.float32)
@@ -438,3 +583,12 @@ class ColorShift(ColorSource):
         vals = np.full(num_leds, current_val, dtype=np.float32)
 
         return hues, sats, vals
+
+    def get_rgb_arrays(self, num_leds: int) -> tuple[np.ndarray, np.ndarray]:
+        """Looks the current color up in the gradient's pre-baked RGB table."""
+        time_since_start = max(0, (time.monotonic() - self._start_time) - self.delay)
+        progress = (time_since_start / self.cycle_duration) % 1.0
+        rgb, val = self.gradient_source.sample_rgb(progress)
+        return np.broadcast_to(rgb, (num_leds, 3)), np.full(
+            num_leds, val, dtype=np.float32
+        )
@@ -4,17 +4,19 @@
 import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import TypedDict, Unpack
+from typing import Callable, Optional, TypedDict, Unpack
 
-# --- NEW: Import the colour library and our color source abstraction ---
-import colour
 import numpy as np
-from openrgb.utils import RGBColor, RGBContainer
+from openrgb.utils import RGBContainer
 
 from .color_source import ColorSource
 
 DEFAULT_GAMMA = 2.9
 
+# Shared generator for dithering noise; effects are only rendered from the
+# StageManager's update loop, so one generator is never used concurrently.
+_RNG = np.random.default_rng()
+
 
 @dataclass
 class EffectOptions:
@@ -34,8 +36,8 @@ class EffectOptionsKwargs(TypedDict, total=False):
 class Effect(ABC):
     """
     Abstract base class for effects using a brightness-array architecture.
-    This version uses the `colour-science` library for high-performance,
-    accurate color conversions and supports a `reverse` option.
+    Colors come from the source as full-value RGB and are scaled by the
+    final brightness, and a `reverse` option is supported.
     """
 
     def __init__(
@@ -61,8 +63,42 @@ class Effect(ABC):
         self.num_leds = len(self.rgb_container.leds)
         self._is_finished = False
 
+        # Called once with this effect when the StageManager retires it after
+        # it finishes, so owners don't have to poll is_finished() each frame.
+        self.finished_callback: Optional[Callable[["Effect"], None]] = None
+
         self.brightness_array = np.zeros(self.num_leds, dtype=np.float32)
 
+        # Per-LED indices never change for a device, so build them once.
+        self._led_indices = np.arange(self.num_leds, dtype=np.float32)
+
+        # A static source returns the same colors every frame, so they are
+        # fetched once here and reused.
+        self._static_colors: Optional[tuple[np.ndarray, np.ndarray]] = (
+            color_source.get_rgb_arrays(self.num_leds)
+            if color_source.is_static
+            else None
+        )
+
+        # Output buffers reused by calculate_frame on every frame.
+        self._brightness_buffer = np.zeros(self.num_leds, dtype=np.float32)
+        self._dither_buffer = np.zeros(self.num_leds, dtype=np.float32)
+        self._rgb_buffer = np.zeros((self.num_leds, 3), dtype=np.float32)
+        # The frame is packed one uint32 per LED. Its bytes are R, G, B, 0 in
+        # memory, which is also how the SDK lays out colors on the wire.
+        self._frame_bytes = np.zeros((self.num_leds, 4), dtype=np.uint8)
+        self._frame = self._frame_bytes.view(np.uint32).reshape(self.num_leds)
+
+    def reset(self):
+        """
+        Restarts the effect from its initial state so the same object can be
+        added to a StageManager again without re-allocating its buffers.
+        Subclasses with extra animation state extend this.
+        """
+        self.start_time = time.monotonic()
+        self._is_finished = False
+        self.brightness_array.fill(0.0)
+
     @abstractmethod
     def _update_brightness(self):
         """
@@ -76,10 +112,15 @@ class Effect(ABC):
         """Returns True if the effect has signaled that it is complete."""
         return self._is_finished
 
-    def calculate_frame(self) -> list[RGBColor]:
+    def calculate_frame(self) -> np.ndarray:
         """
         Generates the final RGB frame by combining the effect's brightness
         mask with the color source's intrinsic HSV values.
+
+        Returns:
+            A (num_leds,) uint32 array with one packed color per LED, whose
+            bytes are R, G, B, 0. The array is reused by the next call, so
+            callers must copy it if they need to keep it.
         """
         self._update_brightness()
 
@@ -90,26 +131,39 @@ class Effect(ABC):
         )
 
         if self.options.dither_strength > 0.0:
-            noise = np.random.uniform(
-                -self.options.dither_strength,
-                self.options.dither_strength,
-                effect_brightness.shape,
-            )
-            effect_brightness = np.clip(effect_brightness + noise, 0, 1)
+            # Uniform noise in [-strength, strength), drawn and applied in
+            # place in float32 so the brightness never widens to float64.
+            strength = self.options.dither_strength
+            dithered = self._dither_buffer
+            _RNG.random(dtype=np.float32, out=dithered)
+            dithered *= 2.0 * strength
+            dithered -= strength
+            dithered += effect_brightness
+            np.clip(dithered, 0.0, 1.0, out=dithered)
+            effect_brightness = dithered
 
         # --- THE CORE CHANGE ---
-        # 1. Get all three HSV arrays from the source
-        hues, sats, source_brightness = self.color_source.get_hsv_arrays(self.num_leds)
+        # 1. Get the full-value RGB colors and the V array from the source
+        colors = self._static_colors
+        if colors is None:
+            colors = self.color_source.get_rgb_arrays(self.num_leds)
+        rgb, source_brightness = colors
 
         # 2. Multiply the effect's brightness mask with the source's brightness
-        final_brightness = effect_brightness * source_brightness
+        final_brightness = self._brightness_buffer
+        np.multiply(effect_brightness, source_brightness, out=final_brightness)
 
         # 3. Apply gamma correction to the final combined brightness
-        final_brightness = np.power(final_brightness, self.options.gamma)
+        np.power(final_brightness, self.options.gamma, out=final_brightness)
         # --- END OF CORE CHANGE ---
 
-        hsv_array = np.dstack((hues, sats, final_brightness))[0]
-        rgb_float_array = colour.HSV_to_RGB(hsv_array)
-        rgb_int_array = (np.clip(rgb_float_array, 0, 1) * 255).astype(np.uint8)
-
-        return [RGBColor(r, g, b) for r, g, b in rgb_int_array]
+        # RGB is linear in V, so scaling the full-value colors is an exact
+        # HSV to RGB conversion. The 0-255 byte scale is folded into the
+        # per-LED brightness, and the single float -> uint8 conversion of the
+        # pipeline happens here, in place in the reused buffers.
+        final_brightness *= 255.0
+        rgb_buffer = self._rgb_buffer
+        np.multiply(rgb, final_brightness[:, np.newaxis], out=rgb_buffer)
+        np.clip(rgb_buffer, 0.0, 255.0, out=rgb_buffer)
+        np.copyto(self._frame_bytes[:, :3], rgb_buffer, casting="unsafe")
+        return self._frame
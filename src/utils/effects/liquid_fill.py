@@ -5,7 +5,7 @@ import time
 from typing import Unpack
 import numpy as np
 
-from ..debug_utils import debug_print
+from ..debug_utils import DEBUG, debug_print
 
 # Import the core framework components
 from .effect import Effect, EffectOptionsKwargs
@@ -46,9 +46,6 @@ class LiquidFill(Effect):
         # Ensure wavefront_width is at least 1 to avoid division by zero
         self.wavefront_width = max(1, wavefront_width)
 
-        # Create a persistent array of LED indices
-        self._led_indices = np.arange(self.num_leds, dtype=np.float32)
-
     def _update_brightness(self):
         """
         Calculates the brightness of each LED based on the current fill position
@@ -81,6 +78,8 @@ class LiquidFill(Effect):
             1,
             out=self.brightness_array,
         )
-        debug_print(
-            f"LiquidFill: position={position:.2f}, brightness={list(self.brightness_array)}"
-        )
+        if DEBUG:
+            # Guarded so the message isn't formatted every frame for nothing.
+            debug_print(
+                f"LiquidFill: position={position:.2f}, brightness={list(self.brightness_array)}"
+            )
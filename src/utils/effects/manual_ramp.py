@@ -1,6 +1,6 @@
 # file: src/utils/effects/manual_ramp.py
-import numpy as np
 import time
+
 from .effect import Effect
 
 
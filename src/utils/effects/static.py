@@ -51,6 +51,12 @@ class StaticBrightness(Effect):
         self.duration = duration
         self._start_time = None
 
+    def reset(self):
+        """Restarts the duration timer and restores the static brightness."""
+        super().reset()
+        self.brightness_array.fill(self.brightness_level)
+        self._start_time = None
+
     def _update_brightness(self):
         """
         This effect's brightness is static, but if duration is set, it will finish after the specified time.
@@ -1,3 +1,4 @@
+import socket
 import time
 import traceback
 from dataclasses import dataclass
@@ -98,21 +99,22 @@ def get_motherboard_and_dram_devices(client: OpenRGBClient) -> list[Device]:
     return devices
 
 
-if __name__ == "__main__":
-    # Test
-    client = OpenRGBClient()
-    devices = get_motherboard_and_dram_devices(client)
-    print(f"Found {len(devices)} MOTHERBOARD/DRAM devices:")
-    for dev in devices:
-        print(f"- {dev.name} ({dev.type.name})")
+# --- Configuration Constants ---
+SERVER_POLL_TIMEOUT = 15  # Max seconds to wait for the server to start
+SERVER_POLL_INTERVAL = 0.2  # Seconds between connection attempts
 
 
-# ... (all your other imports) ...
+def disable_nagle(client: OpenRGBClient):
+    """
+    Turns on TCP_NODELAY for the client's SDK socket.
 
-# --- Configuration Constants (Can be in a separate file) ---
-# ... (all your configs like FPS, ZONE_CONFIGS, etc.) ...
-SERVER_POLL_TIMEOUT = 15  # Max seconds to wait for the server to start
-SERVER_POLL_INTERVAL = 0.2  # Seconds between connection attempts
+    The client writes every packet as a header followed by a separate data
+    write. With Nagle's algorithm on, that second small write waits for the
+    server to ACK the first, which adds delayed-ACK latency to each frame.
+    """
+    sock = client.comms.sock
+    if sock is not None:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
 
 
 # --- NEW: Connection Polling Function ---
@@ -151,6 +153,7 @@ def connect_with_retry(
                         print(
                             f"  - Success! Detected {len(devices)} devices with {len(motherboard.zones)} zones."
                         )
+                        disable_nagle(client)
                         return client
                     else:
                         print(
@@ -178,7 +181,7 @@ def setup_hardware_with_retry(
     interval: float,
     zone_configs: list[ZoneConfig],
     device_types: list[DeviceType],
-) -> tuple[StageManager, dict[str, Device], list[Device], list[Device]]:
+) -> tuple[StageManager, dict[str, Device], list[Device], tuple[Device, ...]]:
     """
     Configures all required hardware, retrying until success or timeout.
     """
@@ -201,8 +204,8 @@ def setup_hardware_with_retry(
             if strimmer and fans and dram_sticks:
                 # 3. If everything succeeded, we are done.
                 print("--- Hardware Configuration Successful ---")
-                all_managed_devices = (
-                    list(motherboard_zones.values()) + standalone_devices
+                all_managed_devices = tuple(motherboard_zones.values()) + tuple(
+                    standalone_devices
                 )
                 manager = StageManager(all_managed_devices)
                 return (
@@ -229,3 +232,12 @@ def setup_hardware_with_retry(
     raise TimeoutError(
         f"Could not successfully configure all hardware within {timeout} seconds."
     )
+
+
+if __name__ == "__main__":
+    # Test
+    client = OpenRGBClient()
+    devices = get_motherboard_and_dram_devices(client)
+    print(f"Found {len(devices)} MOTHERBOARD/DRAM devices:")
+    for dev in devices:
+        print(f"- {dev.name} ({dev.type.name})")